@@ -20,7 +20,7 @@ import re
 from agents.utils.data_models import (
     TripDetails,
     TripDuration,
-    PreliminarySuggestions,
+    parse_preliminary_suggestions,
 )
 
 from agents.phase1.location_finder.agent import location_finder_agent
@@ -129,24 +129,21 @@ class Phase1Supervisor:
             
             # Try to find JSON in the response
             json_match = re.search(r'\{.*\}', final_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                stored_dict = json.loads(json_str)
-            else:
+            if not json_match:
                 raise ValueError(f"No JSON found in agent response: {final_text}")
 
-            # Parse into PreliminarySuggestions
-            prelim = PreliminarySuggestions(**stored_dict)
+            # Parse straight from JSON into PreliminarySuggestions
+            prelim = parse_preliminary_suggestions(json_match.group(0))
 
             # Normalize for frontend
             destinations = [
                 {
-                    "destination": s.destination,
-                    "country": s.country,
-                    "recommended_activities": s.recommended_activities,
-                    "description": s.description,
-                    "image_url": s.image_url,
-                    "estimated_budget": s.estimated_budget,
+                    "destination": s["destination"],
+                    "country": s["country"],
+                    "recommended_activities": s["recommended_activities"],
+                    "description": s["description"],
+                    "image_url": s.get("image_url"),
+                    "estimated_budget": s["estimated_budget"],
                 }
                 for s in prelim.preliminary_location_suggestions
             ]
@@ -10,18 +10,19 @@ Activity Finder Supervisor
 - Returns ActivitySearchResults for the frontend.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
 import uuid
 import re
 import os
+import logging
 
-from agents.utils.data_models import ActivitySearchResults, ActivityDetail
+from agents.utils.data_models import Activity, parse_activity_search_results
 from agents.phase2.activity_finder.agent import activity_finder_agent
 
 # Optional: Import Tavily for enrichment
 try:
-    from tools.activity_search import tavily_search_activities
+    from tools.activity_search import tavily_search_activities_batch
     TAVILY_AVAILABLE = bool(os.environ.get("TAVILY_API_KEY"))
 except Exception:
     TAVILY_AVAILABLE = False
@@ -31,6 +32,8 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+logger = logging.getLogger(__name__)
+
 # -----------------------------
 # ADK runtime global setup
 # -----------------------------
@@ -68,28 +71,30 @@ class ActivityFinderSupervisor:
             "budget_per_person": req.budget_per_person,
         }
 
-    def _enrich_with_tavily(self, activity: ActivityDetail, city: str) -> ActivityDetail:
+    async def _enrich_with_tavily(self, activities: List[Activity], city: str) -> List[Activity]:
         """
         Optionally enrich activity details with Tavily search.
         This provides additional verification and details from a second source.
+        All activities are searched concurrently.
         """
-        if not TAVILY_AVAILABLE:
-            return activity
+        if not TAVILY_AVAILABLE or not activities:
+            return activities
         
         try:
             # Search for additional pricing/duration info
-            query = f"{activity.name} {city} price duration tickets"
-            tavily_results = tavily_search_activities(query, max_results=2)
+            queries = [f"{activity.name} {city} price duration tickets" for activity in activities]
+            batch_results = await tavily_search_activities_batch(queries, max_results=2)
             
             # Log that we got additional info (could be used to enhance description)
-            if tavily_results and tavily_results[0].get("content"):
-                print(f"[Tavily] Found additional info for {activity.name}")
-                # Could merge/verify pricing here if needed
+            for activity, tavily_results in zip(activities, batch_results):
+                if tavily_results and tavily_results[0].content:
+                    logger.debug("[Tavily] Found additional info for %s", activity.name)
+                    # Could merge/verify pricing here if needed
             
         except Exception as e:
-            print(f"[Tavily] Enrichment failed for {activity.name}: {e}")
+            logger.warning("[Tavily] Enrichment failed for %s: %s", city, e)
         
-        return activity
+        return activities
 
     async def run(self, req) -> Dict[str, Any]:
         """
@@ -130,20 +135,16 @@ class ActivityFinderSupervisor:
             # Parse the JSON from the text response
             # Try to find JSON in the response
             json_match = re.search(r'\{.*\}', final_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                stored_dict = json.loads(json_str)
-            else:
+            if not json_match:
                 raise ValueError(f"No JSON found in agent response: {final_text}")
 
-            # Parse into ActivitySearchResults
-            activity_results = ActivitySearchResults(**stored_dict)
+            # Parse straight from JSON into ActivitySearchResults
+            activity_results = parse_activity_search_results(json_match.group(0))
 
             # Optionally enrich with Tavily (if available)
-            enriched_activities = []
-            for activity in activity_results.activities:
-                enriched = self._enrich_with_tavily(activity, req.city)
-                enriched_activities.append(enriched)
+            enriched_activities = await self._enrich_with_tavily(
+                activity_results.activities, req.city
+            )
 
             return {
                 "status": "success",
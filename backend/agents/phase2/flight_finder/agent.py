@@ -1,6 +1,5 @@
 # agent.py - Google ADK Flight Finder Agent
 
-from typing import List, Dict, Any
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from google.adk.tools.agent_tool import AgentTool
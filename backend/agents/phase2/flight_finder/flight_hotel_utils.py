@@ -1,13 +1,10 @@
 # flight_utils.py
 
 import os
-import json
-from typing import List, Dict, Any
+from typing import Dict, Any
 from dotenv import load_dotenv
 from openai import OpenAI
 from serpapi import GoogleSearch
-from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 from concurrent.futures import ThreadPoolExecutor
 # Load environment variables
 load_dotenv()
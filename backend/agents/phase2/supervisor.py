@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional, List
 import json
 import uuid
 import re
+import logging
+import orjson
 # from pydantic import BaseModel, Field, ValidationError
 from datetime import date
 
@@ -35,7 +37,6 @@ from agents.utils.data_models import (
 
 from agents.phase2.activity_finder.agent import activity_finder_agent
 from agents.phase2.flight_finder.agent import flight_hotel_finder_agent
-from agents.utils.instructions_loader import load_instruction_from_file
 # ADK workflow agents
 from google.adk.agents.parallel_agent import ParallelAgent
 
@@ -46,6 +47,8 @@ from google.genai import types
 
 
 
+logger = logging.getLogger(__name__)
+
 # ========================================
 # ADK Runtime Setup
 # ========================================
@@ -57,11 +60,6 @@ session_service = InMemorySessionService()
 # ========================================
 # Orchestrator Agent
 # ========================================
-orchestrator_instruction = load_instruction_from_file(
-    "orchestrator_agent_instructions.txt"
-    # relative_to_caller=True
-)
-
 orchestrator_agent = ParallelAgent(
     name="Phase2OrchestratorAgent",
     sub_agents=[activity_finder_agent, flight_hotel_finder_agent],
@@ -74,6 +72,18 @@ orchestrator_runner = Runner(
     session_service=session_service,
 )
 
+# Final events are routed into the orchestrator output by their author
+_AUTHOR_OUTPUT_KEYS = {
+    activity_finder_agent.name: "activities",
+    flight_hotel_finder_agent.name: "flights_and_hotels",
+}
+
+# Markdown code fences (```json ... ```) wrapped around agent JSON
+_FENCE_RE = re.compile(r'```(?:json)?\s*')
+
+# First number in a cost string like "35-57 USD" or "$35"
+_LEADING_NUM_RE = re.compile(r'[\d.]+')
+
 
 # ========================================
 # Phase 2 Supervisor
@@ -88,7 +98,8 @@ class Phase2Supervisor:
     - Returns Phase2Response
     """
 
-    def _build_combined_prompt(self, request: Phase2PlanningRequest) -> dict:
+    @staticmethod
+    def _build_combined_prompt(request: Phase2PlanningRequest) -> dict:
         """Build input for orchestrator agent"""
         activity_budget_per_person = request.trip_context.budget_per_person * 0.5
         
@@ -102,17 +113,17 @@ class Phase2Supervisor:
             
             # Flight/Hotel fields
             "origin_city": request.trip_context.origin_location,
-            "outbound_date": request.trip_context.startDate,
-            "return_date": request.trip_context.endDate,
+            "outbound_date": request.trip_context.startDate.isoformat(),
+            "return_date": request.trip_context.endDate.isoformat(),
             "destination_country": request.selected_destination.country,
             # "origin_country": request.trip_context.origin_location,
         }
 
-    def _extract_json_from_text(self, text: str) -> dict:
+    @staticmethod
+    def _extract_json_from_text(text: str) -> dict:
         """Extract and merge JSON objects from text (handles multiple agent outputs)"""
         # Strip markdown code block wrappers
-        clean_text = re.sub(r'```json\s*', '', text)
-        clean_text = re.sub(r'```\s*', '', clean_text)
+        clean_text = _FENCE_RE.sub('', text)
         
         # Find all JSON objects in the text
         json_objects = []
@@ -157,7 +168,27 @@ class Phase2Supervisor:
         
         return merged
 
-    def _parse_orchestrator_output(self, raw_data: dict) -> dict:
+    @staticmethod
+    def _route_final_text(author: str, text: str, raw_json: dict) -> None:
+        """
+        Parse a final event's text and store it under the key for its author.
+
+        Each sub-agent normally emits one clean JSON block, so this avoids
+        re-scanning the concatenated response. Anything that doesn't parse is
+        left for the _extract_json_from_text fallback.
+        """
+        key = _AUTHOR_OUTPUT_KEYS.get(author)
+        if key is None:
+            return
+        try:
+            parsed = orjson.loads(_FENCE_RE.sub('', text).strip())
+        except orjson.JSONDecodeError:
+            return
+        if isinstance(parsed, dict):
+            raw_json[key] = parsed
+
+    @staticmethod
+    def _parse_orchestrator_output(raw_data: dict) -> dict:
         """
         Parse raw JSON from orchestrator.
         
@@ -189,8 +220,8 @@ class Phase2Supervisor:
         
         return raw_data
 
+    @staticmethod
     def _calculate_costs(
-        self, 
         orchestrator_data: dict,
         num_travelers: int
     ) -> dict:
@@ -207,11 +238,11 @@ class Phase2Supervisor:
             activities = orchestrator_data.get("activities", {}).get("activities", [])
             if activities:
                 costs["activities"] = sum(
-                    self._parse_cost(act.get("estimated_cost_per_person", 0)) * num_travelers
+                    Phase2Supervisor._parse_cost(act.get("estimated_cost_per_person", 0)) * num_travelers
                     for act in activities
                 )
         except Exception as e:
-            print(f"[Cost Calc] Warning: Failed to calculate activity costs: {e}")
+            logger.warning("[Cost Calc] Failed to calculate activity costs: %s", e)
         
         # Flight costs
         try:
@@ -220,33 +251,39 @@ class Phase2Supervisor:
             returns = fh.get("return_top_2_flights", [])
             
             if outbound:
-                costs["flights"] += sum(self._parse_cost(f.get("price_usd", 0)) for f in outbound)
+                costs["flights"] += sum(Phase2Supervisor._parse_cost(f.get("price_usd", 0)) for f in outbound)
             if returns:
-                costs["flights"] += sum(self._parse_cost(f.get("price_usd", 0)) for f in returns)
+                costs["flights"] += sum(Phase2Supervisor._parse_cost(f.get("price_usd", 0)) for f in returns)
         except Exception as e:
-            print(f"[Cost Calc] Warning: Failed to calculate flight costs: {e}")
+            logger.warning("[Cost Calc] Failed to calculate flight costs: %s", e)
         
         # Hotel costs (take cheapest from scenario 1 as baseline)
         try:
             fh = orchestrator_data.get("flights_and_hotels", {})
             hotels_1 = fh.get("hotel_options_flight_1", {}).get("cheapest", [])
             if hotels_1:
-                costs["hotels"] = self._parse_cost(hotels_1[0].get("price", 0))
+                costs["hotels"] = Phase2Supervisor._parse_cost(hotels_1[0].get("price", 0))
         except Exception as e:
-            print(f"[Cost Calc] Warning: Failed to calculate hotel costs: {e}")
+            logger.warning("[Cost Calc] Failed to calculate hotel costs: %s", e)
         
         costs["total"] = costs["activities"] + costs["flights"] + costs["hotels"]
         return costs
     
-    def _parse_cost(self, cost_value) -> float:
+    @staticmethod
+    def _parse_cost(cost_value) -> float:
         """Parse cost value - handles strings like '35-57 USD' or '35.00'"""
-        if isinstance(cost_value, (int, float)):
+        # Exact type checks for the common cases; isinstance handles the rest
+        t = type(cost_value)
+        if t is float:
+            return cost_value
+        if t is int:
             return float(cost_value)
-        if isinstance(cost_value, str):
+        if t is str:
             # Extract first number from string like "35-57 USD" or "$35"
-            numbers = re.findall(r'[\d.]+', cost_value)
-            if numbers:
-                return float(numbers[0])
+            m = _LEADING_NUM_RE.search(cost_value)
+            return float(m.group()) if m else 0.0
+        if isinstance(cost_value, (int, float)):
+            return float(cost_value)
         return 0.0
     
     async def run(self, request: Phase2PlanningRequest) -> Phase2Response:
@@ -260,13 +297,14 @@ class Phase2Supervisor:
         4. Parse with Pydantic models
         5. Return Phase2Response
         """
-        print(f"\n{'='*60}")
-        print(f"[Phase2Supervisor] Starting Phase 2 Planning")
-        print(f"Destination: {request.selected_destination.destination}")
-        print(f"Origin: {request.trip_context.origin_location}")
-        print(f"Travelers: {request.trip_context.numTravelers}")
-        print(f"Dates: {request.trip_context.startDate} → {request.trip_context.endDate}")
-        print(f"{'='*60}\n")
+        logger.info(
+            "[Phase2Supervisor] Starting Phase 2 Planning: destination=%s origin=%s travelers=%s dates=%s → %s",
+            request.selected_destination.destination,
+            request.trip_context.origin_location,
+            request.trip_context.numTravelers,
+            request.trip_context.startDate,
+            request.trip_context.endDate,
+        )
         
         try:
             # Build input
@@ -286,7 +324,7 @@ class Phase2Supervisor:
                 parts=[types.Part(text=json.dumps(combined_prompt))],
             )
             
-            print(f"[Phase2Supervisor] Running orchestrator agent...")
+            logger.debug("[Phase2Supervisor] Running orchestrator agent...")
             
             # Run orchestrator
             events = orchestrator_runner.run_async(
@@ -297,49 +335,64 @@ class Phase2Supervisor:
             
             # ✨ Collect ONLY final response (no streaming, just final)
             final_response_text = ""
+            raw_json: Dict[str, Any] = {}
             event_count = 0
             final_event_count = 0
             
-            async for event in events:
-                event_count += 1
-                
-                # Debug logging
-                author = getattr(event, 'author', 'unknown')
-                is_final = event.is_final_response()
-                print(f"[Event {event_count}] Author: {author}, is_final: {is_final}")
-                
-                # Collect final response only
-                if is_final:
-                    final_event_count += 1
-                    if event.content and event.content.parts:
-                        # Get text from first part (as per documentation)
-                        text = event.content.parts[0].text
-                        if text:
-                            final_response_text += text
-                            print(f"  ✓ Captured {len(text)} characters from final response")
+            try:
+                async for event in events:
+                    event_count += 1
+                    
+                    # Debug logging
+                    author = getattr(event, 'author', 'unknown')
+                    is_final = event.is_final_response()
+                    logger.debug("[Event %d] Author: %s, is_final: %s", event_count, author, is_final)
+                    
+                    # Collect final response only
+                    if is_final:
+                        final_event_count += 1
+                        if event.content and event.content.parts:
+                            # Get text from first part (as per documentation)
+                            text = event.content.parts[0].text
+                            if text:
+                                final_response_text += text
+                                logger.debug("  ✓ Captured %d characters from final response", len(text))
+                                self._route_final_text(author, text, raw_json)
+                    
+                    # Both sub-agents have answered; skip any trailing events
+                    if "activities" in raw_json and "flights_and_hotels" in raw_json:
+                        break
+            finally:
+                # Let ADK tear down its generator cleanly when we stop early
+                await events.aclose()
             
-            print(f"\n[Phase2Supervisor] Event Summary:")
-            print(f"  Total events: {event_count}")
-            print(f"  Final events: {final_event_count}")
-            print(f"  Response length: {len(final_response_text)} chars")
+            logger.info(
+                "[Phase2Supervisor] Event Summary: total=%d final=%d response_length=%d chars",
+                event_count, final_event_count, len(final_response_text),
+            )
             
             if not final_response_text:
                 raise ValueError("No final response received from orchestrator")
             
             # Show preview
-            print(f"\n[Phase2Supervisor] Response Preview:")
-            print(f"  First 300 chars: {final_response_text[:300]}")
-            print(f"  Last 200 chars: {final_response_text[-200:]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[Phase2Supervisor] Response Preview:\n  First 300 chars: %s\n  Last 200 chars: %s",
+                    final_response_text[:300], final_response_text[-200:],
+                )
             
-            # Extract JSON
-            print(f"\n[Phase2Supervisor] Extracting JSON...")
-            raw_json = self._extract_json_from_text(final_response_text)
-            print(f"  ✓ JSON extracted successfully")
+            # Extract JSON (only re-scan the whole response if routing by author was incomplete)
+            if "activities" in raw_json and "flights_and_hotels" in raw_json:
+                logger.debug("[Phase2Supervisor] ✓ JSON routed by author")
+            else:
+                logger.debug("[Phase2Supervisor] Extracting JSON...")
+                raw_json = self._extract_json_from_text(final_response_text)
+                logger.debug("  ✓ JSON extracted successfully")
             
             # Validate structure
-            print(f"[Phase2Supervisor] Validating structure...")
+            logger.debug("[Phase2Supervisor] Validating structure...")
             orchestrator_data = self._parse_orchestrator_output(raw_json)
-            print(f"  ✓ Structure validation passed")
+            logger.debug("  ✓ Structure validation passed")
             
             # Log what we got
             activities = orchestrator_data.get("activities", {}).get("activities", [])
@@ -347,11 +400,12 @@ class Phase2Supervisor:
             outbound = fh.get("outbound_top_2_flights", [])
             returns = fh.get("return_top_2_flights", [])
             
-            print(f"\n[Phase2Supervisor] Parsed Results:")
-            print(f"  Activities: {len(activities)}")
-            print(f"  Outbound flights: {len(outbound)}")
-            print(f"  Return flights: {len(returns)}")
-            print(f"  Raw flights_and_hotels structure: {json.dumps(fh, indent=2)[:500]}...")
+            logger.info(
+                "[Phase2Supervisor] Parsed Results: activities=%d outbound_flights=%d return_flights=%d",
+                len(activities), len(outbound), len(returns),
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  Raw flights_and_hotels structure: %s...", json.dumps(fh, indent=2)[:500])
             
             # ========================================
             # Map orchestrator_data to Phase2Response models
@@ -379,10 +433,10 @@ class Phase2Supervisor:
                         destination=activities_data.get("destination", "Unknown"),
                         activities=[Activity(**act) for act in processed_activities]
                     )
-                    print(f"  ✓ Mapped {len(activities_result.activities)} activities")
+                    logger.debug("  ✓ Mapped %d activities", len(activities_result.activities))
             except Exception as e:
                 errors.append(f"Failed to map activities: {str(e)}")
-                print(f"  ✗ Activity mapping error: {str(e)}")
+                logger.warning("  ✗ Activity mapping error: %s", e)
             
             # Parse Flights
             try:
@@ -391,25 +445,26 @@ class Phase2Supervisor:
                 return_data = fh_data.get("return_top_2_flights", [])
                 
                 if outbound_data and return_data:
-                    flights_result = FlightRecommendations(
+                    # FlightOptions are validated individually; the container just holds them
+                    flights_result = FlightRecommendations.model_construct(
                         outbound_flights=[FlightOption(**f) for f in outbound_data],
                         return_flights=[FlightOption(**f) for f in return_data]
                     )
-                    print(f"  ✓ Mapped {len(flights_result.outbound_flights)} outbound, {len(flights_result.return_flights)} return flights")
+                    logger.debug("  ✓ Mapped %d outbound, %d return flights", len(flights_result.outbound_flights), len(flights_result.return_flights))
             except Exception as e:
                 errors.append(f"Failed to map flights: {str(e)}")
-                print(f"  ✗ Flight mapping error: {str(e)}")
+                logger.warning("  ✗ Flight mapping error: %s", e)
             # errors = []
             # warnings = []
             # Parse Hotels
             # Parse Hotels
             try:
                 fh_data = orchestrator_data.get("flights_and_hotels", {})
-                print(f"\n[DEBUG] flights_and_hotels keys: {fh_data.keys()}")
+                logger.debug("flights_and_hotels keys: %s", fh_data.keys())
                 hotel_1 = fh_data.get("hotel_options_flight_1", {})
                 hotel_2 = fh_data.get("hotel_options_flight_2", {})
-                print(f"[DEBUG] hotel_1: {hotel_1}")
-                print(f"[DEBUG] hotel_2: {hotel_2}")
+                logger.debug("hotel_1: %s", hotel_1)
+                logger.debug("hotel_2: %s", hotel_2)
                 
                 if hotel_1 or hotel_2:
                     # Helper to process hotel list and fix price format, add category label
@@ -435,7 +490,8 @@ class Phase2Supervisor:
                         process_hotels(hotel_2.get("most_expensive", []), "Luxury")
                     )
                     
-                    hotels_result = HotelRecommendations(
+                    # HotelOptions are validated individually; the containers just hold them
+                    hotels_result = HotelRecommendations.model_construct(
                         scenario_A=HotelCategory(
                             hotels=[HotelOption(**h) for h in scenario_A_hotels],
                             category="flight_1_options"
@@ -445,10 +501,10 @@ class Phase2Supervisor:
                             category="flight_2_options"
                         )
                     )
-                    print(f"  ✓ Mapped {len(hotels_result.scenario_A.hotels)} hotels for scenario A, {len(hotels_result.scenario_B.hotels)} for scenario B")
+                    logger.debug("  ✓ Mapped %d hotels for scenario A, %d for scenario B", len(hotels_result.scenario_A.hotels), len(hotels_result.scenario_B.hotels))
             except Exception as e:
                 errors.append(f"Failed to map hotels: {str(e)}")
-                print(f"  ✗ Hotel mapping error: {str(e)}")
+                logger.warning("  ✗ Hotel mapping error: %s", e)
             
             costs = self._calculate_costs(orchestrator_data, request.trip_context.numTravelers)
             # Determine status
@@ -470,11 +526,10 @@ class Phase2Supervisor:
             else:
                 status = "success"
             
-            print(f"\n[Phase2Supervisor] ✓ Phase 2 Complete")
-            print(f"  Status: {status}")
-            print(f"{'='*60}\n")
+            logger.info("[Phase2Supervisor] ✓ Phase 2 Complete: status=%s", status)
             
-            return Phase2Response(
+            # Every field is already a validated model or a value built above
+            return Phase2Response.model_construct(
                 status=status,
                 activities=activities_result,
                 flights=flights_result,
@@ -486,8 +541,12 @@ class Phase2Supervisor:
             
         except json.JSONDecodeError as e:
             error_msg = f"JSON parsing failed: {str(e)}"
-            print(f"\n[Phase2Supervisor] ✗ {error_msg}")
-            print(f"Raw response (first 500 chars): {final_response_text[:500] if 'final_response_text' in locals() else 'N/A'}")
+            logger.error("[Phase2Supervisor] ✗ %s", error_msg)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Raw response (first 500 chars): %s",
+                    final_response_text[:500] if 'final_response_text' in locals() else 'N/A',
+                )
             return Phase2Response(
                 status="error",
                 activities=None,
@@ -501,7 +560,7 @@ class Phase2Supervisor:
         except ValueError as e:
             # Catches validation errors from _parse_orchestrator_output
             error_msg = f"Structure validation failed: {str(e)}"
-            print(f"\n[Phase2Supervisor] ✗ {error_msg}")
+            logger.error("[Phase2Supervisor] ✗ %s", error_msg)
             return Phase2Response(
                 status="error",
                 activities=None,
@@ -513,16 +572,12 @@ class Phase2Supervisor:
             )
             
         except Exception as e:
-            import traceback
             error_msg = str(e)
-            stack_trace = traceback.format_exc()
             
-            print(f"\n{'='*60}")
-            print(f"[Phase2Supervisor] ✗ CRITICAL ERROR")
-            print(f"Type: {type(e).__name__}")
-            print(f"Error: {error_msg}")
-            print(f"Stack Trace:\n{stack_trace}")
-            print(f"{'='*60}\n")
+            logger.exception(
+                "[Phase2Supervisor] ✗ CRITICAL ERROR\nType: %s\nError: %s",
+                type(e).__name__, error_msg,
+            )
             
             return Phase2Response(
                 status="error",
@@ -13,9 +13,14 @@ from typing import Dict, Any
 import json
 import uuid
 import re
+import math
+import logging
 from datetime import datetime
 
+from cachetools import LRUCache
+
 from agents.utils.data_models import (
+    CostBreakdown,
     Phase3Input,
     Phase3Response,
     DayPlan,
@@ -28,6 +33,8 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+logger = logging.getLogger(__name__)
+
 # ========================================
 # ADK Runtime Setup
 # ========================================
@@ -44,6 +51,35 @@ phase3_runner = Runner(
 )
 
 
+# ========================================
+# Narrative parsing
+# ========================================
+# "## Day N (date)" header followed by its content, up to the next section
+_DAY_RE = re.compile(
+    r'## Day (\d+) \(([^)]+)\)(.*?)(?=## Day \d+|## Activities Not Included|$)',
+    re.DOTALL,
+)
+# Bullet line ("- ..." or "* ..."); group 1 is the text after the bullet markers
+_BULLET_RE = re.compile(r'^[ \t]*[-*]+[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+# Section headers to skip when collecting bullets (compared lowercased)
+_SECTION_HEADERS: frozenset[str] = frozenset({
+    'morning', 'afternoon', 'evening', 'full day', 
+    'morning/afternoon', 'afternoon/evening',
+    'morning (optional)', 'afternoon (optional)', 'evening (optional)'
+})
+
+# Emphasis spans in one pass: **bold** / __bold__ (groups 1-2) or *italic* / _italic_ (groups 3-4)
+_MD_EMPHASIS_RE = re.compile(r'(\*\*|__)(.+?)\1|([*_])(.+?)\3')
+# Leftover leading/trailing asterisks
+_MD_TRIM_RE = re.compile(r'^\*+\s*|\s*\*+$')
+
+
+def _unwrap_emphasis(match: re.Match) -> str:
+    """Replace an emphasis span with its text, unwrapping nested spans (e.g. **a *b* c**)."""
+    return _MD_EMPHASIS_RE.sub(_unwrap_emphasis, match.group(2) or match.group(4))
+
+
 # ========================================
 # Phase 3 Supervisor
 # ========================================
@@ -58,20 +94,49 @@ class Phase3Supervisor:
 
     def _clean_markdown(self, text: str) -> str:
         """Remove markdown formatting from text"""
-        # Remove bold (**text** or __text__)
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
+        # Common case: plain bullet text with no emphasis markers at all
+        if '*' not in text and '_' not in text:
+            return text.strip()
         
-        # Remove italic (*text* or _text_)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
+        # Unwrap bold/italic in one pass, then drop leftover leading/trailing asterisks
+        return _MD_TRIM_RE.sub('', _MD_EMPHASIS_RE.sub(_unwrap_emphasis, text)).strip()
+    
+    def _parse_day_block(self, match: re.Match) -> DayPlan:
+        """Build a DayPlan from one '## Day N (date)' match of _DAY_RE."""
+        day_num_str, date_str, content = match.group(1, 2, 3)
+        day_num = int(day_num_str)
+        date_str = date_str.strip()
+        content = content.strip()
         
-        # Remove leftover single/double asterisks or underscores
-        text = re.sub(r'^\*+\s*', '', text)  # Leading asterisks
-        text = re.sub(r'\s*\*+$', '', text)  # Trailing asterisks
+        # Extract activities from bullet points
+        activities = []
+        for bullet in _BULLET_RE.finditer(content):
+            # Clean the bullet payload - remove markdown
+            cleaned = self._clean_markdown(bullet.group(1))
+            
+            # Skip empty lines, malformed entries, or section headers
+            if cleaned and len(cleaned) > 3:
+                # Check if it's just a section header
+                cleaned_lower = cleaned.lower().strip(':').strip()
+                if cleaned_lower not in _SECTION_HEADERS:
+                    activities.append(cleaned)
         
-        return text.strip()
-    
+        # Generate title from first activity or generic
+        title = f"Day {day_num}"
+        if activities:
+            first_activity = activities[0].partition(':')[0]
+            title = self._clean_markdown(first_activity[:50])  # First 50 chars
+        
+        # Fields are built here with the right types; DayPlan is a plain dataclass
+        return DayPlan(
+            day_number=day_num,
+            date=date_str,
+            title=title,
+            activities=activities,
+            meals=[],
+            notes=""
+        )
+
     def _parse_narrative_to_structured(
         self, 
         narrative: str, 
@@ -89,88 +154,47 @@ class Phase3Supervisor:
         """
         
         # Extract daily plans using regex
-        day_pattern = r'## Day (\d+) \(([^)]+)\)(.*?)(?=## Day \d+|## Activities Not Included|$)'
-        matches = re.finditer(day_pattern, narrative, re.DOTALL)
-        
-        daily_plans = []
-        for match in matches:
-            day_num = int(match.group(1))
-            date = match.group(2).strip()
-            content = match.group(3).strip()
-            
-            # Extract activities from bullet points
-            activities = []
-            # Section headers to skip (case-insensitive)
-            section_headers = {
-                'morning', 'afternoon', 'evening', 'full day', 
-                'morning/afternoon', 'afternoon/evening',
-                'morning (optional)', 'afternoon (optional)', 'evening (optional)'
-            }
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('-') or line.startswith('*'):
-                    # Clean the line - remove leading bullet and markdown
-                    cleaned = line.lstrip('-*').strip()
-                    cleaned = self._clean_markdown(cleaned)
-                    
-                    # Skip empty lines, malformed entries, or section headers
-                    if cleaned and len(cleaned) > 3:
-                        # Check if it's just a section header
-                        cleaned_lower = cleaned.lower().strip(':').strip()
-                        if cleaned_lower not in section_headers:
-                            activities.append(cleaned)
-            
-            # Generate title from first activity or generic
-            title = f"Day {day_num}"
-            if activities:
-                first_activity = activities[0].split(':')[0] if ':' in activities[0] else activities[0]
-                title = self._clean_markdown(first_activity[:50])  # First 50 chars
-            
-            daily_plans.append(DayPlan(
-                day_number=day_num,
-                date=date,
-                title=title,
-                activities=activities,
-                meals=[],
-                notes=""
-            ))
+        daily_plans = [self._parse_day_block(match) for match in _DAY_RE.finditer(narrative)]
         
         # Calculate costs CORRECTLY (per person vs per room)
-        # Parse dates
-        start_date = datetime.strptime(input_data.trip_start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(input_data.trip_end_date, "%Y-%m-%d")
+        # Dates arrive already parsed by Phase3Input
+        start_date = input_data.trip_start_date
+        end_date = input_data.trip_end_date
         num_nights = (end_date - start_date).days
         
+        n = input_data.num_travelers
+        
         # 1. FLIGHTS: Price is PER PERSON → multiply by travelers
         flight_cost_per_person = input_data.outbound_flight.price_usd + input_data.return_flight.price_usd
-        total_flight_cost = flight_cost_per_person * input_data.num_travelers
+        total_flight_cost = flight_cost_per_person * n
         
         # 2. HOTEL: Price is PER NIGHT (for the room, NOT per person) → multiply by nights ONLY
         total_hotel_cost = input_data.selected_hotel.price * num_nights
         
         # 3. ACTIVITIES: Cost is PER PERSON → multiply by travelers
-        activities_cost_per_person = sum(act.estimated_cost_per_person for act in input_data.selected_activities)
-        total_activities_cost = activities_cost_per_person * input_data.num_travelers
+        activities_cost_per_person = math.fsum([act.estimated_cost_per_person for act in input_data.selected_activities])
+        total_activities_cost = activities_cost_per_person * n
         
         # 4. MEALS & MISC: $60 per person per day (covers 3 meals + snacks/tips) → multiply by days AND travelers
         meals_per_person_per_day = 60.0
-        total_meals_misc = meals_per_person_per_day * input_data.num_days * input_data.num_travelers
+        total_meals_misc = meals_per_person_per_day * input_data.num_days * n
+        
+        cost_breakdown = CostBreakdown.model_construct(
+            flights=total_flight_cost,
+            hotel=total_hotel_cost,
+            activities=total_activities_cost,
+            meals_and_misc=total_meals_misc,
+        )
         
         # TOTAL COST for entire trip
         total_cost = total_flight_cost + total_hotel_cost + total_activities_cost + total_meals_misc
         
-        cost_breakdown = {
-            "flights": total_flight_cost,
-            "hotel": total_hotel_cost,
-            "activities": total_activities_cost,
-            "meals_and_misc": total_meals_misc,
-        }
-        
         # Format dates
         dates_str = f"{start_date.strftime('%b %d, %Y')} - {end_date.strftime('%b %d, %Y')}"
         
-        return Phase3Response(
+        # Selections come from the validated Phase3Input and the rest is built
+        # above with the right types, so skip re-validating the whole tree
+        return Phase3Response.model_construct(
             status="success",
             destination=input_data.destination,
             dates=dates_str,
@@ -187,6 +211,38 @@ class Phase3Supervisor:
             warnings=[]
         )
 
+    @staticmethod
+    def _derive_trip_facts(request: Phase3Input) -> Dict[str, Any]:
+        """
+        Precompute the trip arithmetic the planner would otherwise work out itself
+        (night/day counts and per-person cost headroom) so it's sent with the input.
+        """
+        start_date = request.trip_start_date
+        end_date = request.trip_end_date
+        num_nights = (end_date - start_date).days
+        
+        n = request.num_travelers
+        flights_per_person = request.outbound_flight.price_usd + request.return_flight.price_usd
+        hotel_per_person = request.selected_hotel.price * num_nights / n
+        activities_per_person = math.fsum([a.estimated_cost_per_person for a in request.selected_activities])
+        fixed_per_person = flights_per_person + hotel_per_person
+        
+        return {
+            "num_nights": num_nights,
+            "num_trip_days": num_nights + 1,
+            # Day 1 and the last day are travel days
+            "num_full_activity_days": max(0, num_nights - 1),
+            "flights_cost_per_person": round(flights_per_person, 2),
+            "hotel_cost_per_person": round(hotel_per_person, 2),
+            "selected_activities_cost_per_person": round(activities_per_person, 2),
+            "budget_remaining_after_flights_and_hotel_per_person": round(
+                request.budget_per_person - fixed_per_person, 2
+            ),
+            "budget_remaining_after_all_selections_per_person": round(
+                request.budget_per_person - fixed_per_person - activities_per_person, 2
+            ),
+        }
+
     async def run(self, request: Phase3Input) -> Phase3Response:
         """
         Execute Phase 3 itinerary planning.
@@ -198,13 +254,14 @@ class Phase3Supervisor:
         4. Parse into structured response
         5. Return Phase3Response
         """
-        print(f"\n{'='*60}")
-        print(f"[Phase3Supervisor] Starting Itinerary Planning")
-        print(f"Destination: {request.destination}")
-        print(f"Dates: {request.trip_start_date} → {request.trip_end_date}")
-        print(f"Travelers: {request.num_travelers}")
-        print(f"Selected Activities: {len(request.selected_activities)}")
-        print(f"{'='*60}\n")
+        logger.info(
+            "[Phase3Supervisor] Starting Itinerary Planning: destination=%s dates=%s → %s travelers=%s selected_activities=%d",
+            request.destination,
+            request.trip_start_date,
+            request.trip_end_date,
+            request.num_travelers,
+            len(request.selected_activities),
+        )
         
         try:
             # Create session
@@ -215,71 +272,78 @@ class Phase3Supervisor:
                 session_id=session_id,
             )
             
-            # Prepare message (send full Phase3Input as JSON)
+            # Prepare message (full Phase3Input plus precomputed "derived" facts, compact JSON)
+            prompt = request.model_dump(mode="json")
+            prompt["derived"] = self._derive_trip_facts(request)
             user_content = types.Content(
                 role="user",
-                parts=[types.Part(text=request.model_dump_json(indent=2))],
+                parts=[types.Part(text=json.dumps(prompt, separators=(",", ":"), ensure_ascii=False))],
             )
             
-            print(f"[Phase3Supervisor] Running itinerary planner agent...")
+            logger.debug("[Phase3Supervisor] Running itinerary planner agent...")
             
-            # Run agent
-            events = phase3_runner.run_async(
-                user_id=USER_ID,
-                session_id=session_id,
-                new_message=user_content,
-            )
+            # Run agent; the session is only needed for this one run, so drop it
+            # afterwards instead of letting InMemorySessionService keep it forever
+            try:
+                events = phase3_runner.run_async(
+                    user_id=USER_ID,
+                    session_id=session_id,
+                    new_message=user_content,
+                )
             
-            # Collect final response
-            final_response_text = ""
-            event_count = 0
+                # Collect final response (joined once at the end)
+                response_parts = []
+                event_count = 0
             
-            async for event in events:
-                event_count += 1
+                async for event in events:
+                    event_count += 1
                 
-                if event.is_final_response():
-                    if event.content and event.content.parts:
-                        text = event.content.parts[0].text
-                        if text:
-                            final_response_text += text
-                            print(f"  ✓ Captured {len(text)} characters from final response")
+                    if event.is_final_response():
+                        if event.content and event.content.parts:
+                            text = event.content.parts[0].text
+                            if text:
+                                response_parts.append(text)
+                                logger.debug("  ✓ Captured %d characters from final response", len(text))
+            finally:
+                await session_service.delete_session(
+                    app_name=APP_NAME,
+                    user_id=USER_ID,
+                    session_id=session_id,
+                )
+            
+            final_response_text = "".join(response_parts)
             
-            print(f"\n[Phase3Supervisor] Event Summary:")
-            print(f"  Total events: {event_count}")
-            print(f"  Response length: {len(final_response_text)} chars")
+            logger.info(
+                "[Phase3Supervisor] Event Summary: total=%d response_length=%d chars",
+                event_count, len(final_response_text),
+            )
             
             if not final_response_text:
                 raise ValueError("No final response received from itinerary planner")
             
             # Show preview
-            print(f"\n[Phase3Supervisor] Response Preview:")
-            print(f"  First 300 chars: {final_response_text[:300]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Phase3Supervisor] Response Preview: %s", final_response_text[:300])
             
             # Parse narrative to structured response
-            print(f"\n[Phase3Supervisor] Parsing narrative to structured format...")
+            logger.debug("[Phase3Supervisor] Parsing narrative to structured format...")
             result = self._parse_narrative_to_structured(final_response_text, request)
-            print(f"  ✓ Parsed {len(result.daily_plans)} days")
-            
-            print(f"\n[Phase3Supervisor] ✓ Phase 3 Complete")
-            print(f"{'='*60}\n")
+            logger.info("[Phase3Supervisor] ✓ Phase 3 Complete: parsed %d days", len(result.daily_plans))
             
             # Store in memory for PDF generation
             ITINERARY_STORAGE[result.created_at] = result
-            print(f"[Phase3Supervisor] Stored itinerary with key: {result.created_at}")
+            logger.debug("[Phase3Supervisor] Stored itinerary with key: %s", result.created_at)
             
             return result
             
         except Exception as e:
-            import traceback
             error_msg = str(e)
-            stack_trace = traceback.format_exc()
             
-            print(f"\n{'='*60}")
-            print(f"[Phase3Supervisor] ✗ CRITICAL ERROR")
-            print(f"Type: {type(e).__name__}")
-            print(f"Error: {error_msg}")
-            print(f"Stack Trace:\n{stack_trace}")
-            print(f"{'='*60}\n")
+            # logger.exception formats the traceback only if the record is emitted
+            logger.exception(
+                "[Phase3Supervisor] ✗ CRITICAL ERROR\nType: %s\nError: %s",
+                type(e).__name__, error_msg,
+            )
             
             # Return error response
             return Phase3Response(
@@ -293,7 +357,7 @@ class Phase3Supervisor:
                 activities=request.selected_activities,
                 daily_plans=[],
                 total_cost=0.0,
-                cost_breakdown={},
+                cost_breakdown=CostBreakdown(),
                 created_at=datetime.now().isoformat(),
                 errors=[error_msg],
                 warnings=[]
@@ -305,4 +369,5 @@ phase3_supervisor = Phase3Supervisor()
 
 # In-memory storage for generated itineraries (for PDF generation)
 # Key: created_at timestamp, Value: Phase3Response
-ITINERARY_STORAGE = {}
+# Bounded so a long-running server evicts the least recently used itineraries
+ITINERARY_STORAGE = LRUCache(maxsize=256)
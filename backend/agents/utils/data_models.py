@@ -1,7 +1,30 @@
 # agents/utils/data_models.py
 
-from pydantic import BaseModel, Field, PositiveInt
-from typing import Optional, List, Any, Dict
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, List, Any, Dict, Annotated, Literal, Union
+# pydantic requires typing_extensions.TypedDict on Python < 3.12
+from typing_extensions import NotRequired, TypedDict
+
+# Core schemas are built on first use (or by warmup_models at startup) instead of
+# at import, so importing this module stays cheap. String normalization is spelled
+# out as off so every str field stays a plain pass-through check.
+# URLs (booking_url, link, image_url) are deliberately plain `str`, not HttpUrl:
+# they come straight from SerpAPI/agent output and are only echoed back to the
+# frontend, so a per-field RFC 3986 parse would be pure overhead.
+_FAST_CONFIG = ConfigDict(defer_build=True, str_strip_whitespace=False, str_to_lower=False)
+# Containers of already-validated models: keep nested instances as-is
+# (no revalidation or copy) when they're passed in
+_CONTAINER = ConfigDict(**_FAST_CONFIG, revalidate_instances='never')
+# High-fanout leaves parsed from agent output: read-only after construction,
+# unknown keys dropped rather than kept in __pydantic_extra__
+_LEAF = ConfigDict(**_FAST_CONFIG, frozen=True, extra='ignore', validate_assignment=False)
+
+# Closed string sets, validated as Literals
+Status = Literal["success", "partial", "error"]
+HotelScenarioName = Literal["flight_1_options", "flight_2_options"]
 
 # ========================================
 # Phase 1 - Location Search Models
@@ -9,15 +32,19 @@ from typing import Optional, List, Any, Dict
 
 class TripDuration(BaseModel):
     """Defines trip length, using either days or dates."""
-    days: Optional[PositiveInt] = Field(
+    model_config = _FAST_CONFIG
+
+    days: Optional[int] = Field(
         None,
+        gt=0,
+        strict=True,
         description="Total number of days for the trip (must be at least 1)."
     )
-    start_date: Optional[str] = Field(
+    start_date: Optional[date] = Field(
         None,
         description="Start date (YYYY-MM-DD format)."
     )
-    end_date: Optional[str] = Field(
+    end_date: Optional[date] = Field(
         None,
         description="End date (YYYY-MM-DD format)."
     )
@@ -29,6 +56,8 @@ class TripDetails(BaseModel):
     This is built from SearchRequest and contains only the fields
     the agent actually needs.
     """
+    model_config = _FAST_CONFIG
+
     location: str = Field(..., description="User's starting location.")
     numDays: int = Field(..., description="Number of effective trip days (excluding flight days).")
     budget_per_person: float = Field(
@@ -46,18 +75,24 @@ class TripDetails(BaseModel):
     )
 
 
-class LocationSuggestion(BaseModel):
-    """Details for a single preliminary location suggestion."""
+class LocationSuggestion(TypedDict):
+    """
+    Details for a single preliminary location suggestion.
+    A TypedDict rather than a model: it only ever appears inside
+    PreliminarySuggestions, so entries validate as plain dicts.
+    """
     destination: str
     country: str
     recommended_activities: List[str]
     description: str
-    image_url: Optional[str] = Field(None, description="A direct link to an image of the destination.")
-    estimated_budget: str = Field(..., description="Estimated cost range for a trip to this location.")
+    image_url: NotRequired[Annotated[Optional[str], Field(description="A direct link to an image of the destination.")]]
+    estimated_budget: Annotated[str, Field(description="Estimated cost range for a trip to this location.")]
 
 
 class PreliminarySuggestions(BaseModel):
     """The list outputted by the Location Finder Agent."""
+    model_config = _FAST_CONFIG
+
     preliminary_location_suggestions: List[LocationSuggestion] = Field(..., min_length=10)
 
 
@@ -70,6 +105,8 @@ class SelectedDestination(BaseModel):
     Information about the destination selected by user from Phase 1.
     This comes from the rated/preferred destinations.
     """
+    model_config = _FAST_CONFIG
+
     destination: str = Field(..., description="Name of the city")
     country: str = Field(..., description="Country where the city is located")
     recommended_activities: List[str] = Field(
@@ -85,14 +122,16 @@ class TripContext(BaseModel):
     Original trip context from the user's initial search.
     This is retrieved from LAST_SEARCH_REQUEST in Phase 1.
     """
+    model_config = _FAST_CONFIG
+
     origin_location: str = Field(..., description="User's starting/current location")
     numTravelers: int = Field(..., description="Number of travelers", ge=1)
     budget_per_person: float = Field(..., description="Budget per person in USD")
-    startDate: str = Field(..., description="Trip start date (YYYY-MM-DD)")
-    endDate: str = Field(..., description="Trip end date (YYYY-MM-DD)")
+    startDate: date = Field(..., description="Trip start date (YYYY-MM-DD)")
+    endDate: date = Field(..., description="Trip end date (YYYY-MM-DD)")
     numDays: int = Field(..., description="Number of days at destination (excluding flight days)")
     additionalDetails: Optional[List[str]] = Field(
-        default=[],
+        default_factory=list,
         description="Additional user preferences or constraints"
     )
 
@@ -102,6 +141,8 @@ class Phase2PlanningRequest(BaseModel):
     Complete request for Phase 2 itinerary planning.
     Combines selected destination info with original trip context.
     """
+    model_config = _FAST_CONFIG
+
     selected_destination: SelectedDestination
     trip_context: TripContext
 
@@ -110,8 +151,20 @@ class Phase2PlanningRequest(BaseModel):
 # Phase 2 - Activity Models
 # ========================================
 
+class ActivityFinderRequest(BaseModel):
+    """Request for the standalone Activity Finder (activity names to research in a city)"""
+    model_config = _FAST_CONFIG
+
+    activities: List[str] = Field(..., min_length=1, description="Activity names to research")
+    city: str = Field(..., description="Destination city")
+    num_days: int = Field(..., description="Number of days for the trip", ge=1)
+    budget_per_person: float = Field(..., description="Activity budget per person in USD")
+
+
 class Activity(BaseModel):
     """Individual activity with pricing and duration"""
+    model_config = _LEAF
+
     name: str
     description: str
     estimated_duration: str  # e.g., "2 hours", "3 days", "Half day"
@@ -121,6 +174,8 @@ class Activity(BaseModel):
 
 class ActivitySearchResults(BaseModel):
     """Results from Activity Finder Agent"""
+    model_config = _CONTAINER
+
     destination: str  # "City, Country"
     activities: List[Activity]
 
@@ -131,6 +186,8 @@ class ActivitySearchResults(BaseModel):
 
 class FlightOption(BaseModel):
     """Single flight option"""
+    model_config = _LEAF
+
     airline: str
     airplane: Optional[str] = Field(default="N/A", description="Aircraft model (if available)")
     departure_airport_name: str
@@ -142,7 +199,7 @@ class FlightOption(BaseModel):
     total_duration_minutes: int
     stops: int
     price_usd: float
-    booking_url: str
+    booking_url: str  # plain str on purpose, see _FAST_CONFIG
     
     @property
     def total_price(self) -> float:
@@ -152,6 +209,8 @@ class FlightOption(BaseModel):
 
 class FlightRecommendations(BaseModel):
     """Roundtrip flight options"""
+    model_config = _CONTAINER
+
     outbound_flights: List[FlightOption]  # Top 2 outbound
     return_flights: List[FlightOption]    # Top 2 return
 
@@ -162,11 +221,13 @@ class FlightRecommendations(BaseModel):
 
 class HotelOption(BaseModel):
     """Single hotel option"""
+    model_config = _LEAF
+
     name: str
     price: float
     rating: float
     reviews: int
-    link: str
+    link: str  # plain str on purpose, see _FAST_CONFIG
     category: Optional[str] = Field(None, description="Hotel category: Cheapest, Highest Rated, or Luxury")
     
     @property
@@ -175,10 +236,11 @@ class HotelOption(BaseModel):
         return self.price
 
 
-class HotelCategory(BaseModel):
-    """Hotels organized by category"""
+@dataclass(slots=True, frozen=True)
+class HotelCategory:
+    """Hotels organized by category (a slotted record; its HotelOptions are already validated)"""
     hotels: List[HotelOption]
-    category: str  # "cheapest", "highest_rated", "most_expensive", etc.
+    category: HotelScenarioName  # which outbound flight's arrival date these hotels are for
 
 
 class HotelRecommendations(BaseModel):
@@ -188,6 +250,8 @@ class HotelRecommendations(BaseModel):
     scenario_A: Hotels for first outbound flight's arrival date
     scenario_B: Hotels for second outbound flight's arrival date
     """
+    model_config = _CONTAINER
+
     scenario_A: HotelCategory  # For outbound flight 1
     scenario_B: HotelCategory  # For outbound flight 2
 
@@ -209,7 +273,9 @@ class Phase2Response(BaseModel):
     - errors: List of error messages
     - warnings: List of warning messages
     """
-    status: str  # "success" | "partial" | "error"
+    model_config = _CONTAINER
+
+    status: Status
     activities: Optional[ActivitySearchResults] = None
     flights: Optional[FlightRecommendations] = None
     hotels: Optional[HotelRecommendations] = None
@@ -228,16 +294,18 @@ class Phase3Input(BaseModel):
     Contains the user's selections from Phase 2 (flights, hotel, activities) 
     AND the complete trip context including budget.
     """
+    model_config = _FAST_CONFIG
+
     # Trip context (from Phase 1/2)
     destination: str = Field(..., description="City, Country")
     origin_location: str = Field(..., description="User's home location")
-    trip_start_date: str = Field(..., description="Trip start date (YYYY-MM-DD)")
-    trip_end_date: str = Field(..., description="Trip end date (YYYY-MM-DD)")
+    trip_start_date: date = Field(..., description="Trip start date (YYYY-MM-DD)")
+    trip_end_date: date = Field(..., description="Trip end date (YYYY-MM-DD)")
     num_travelers: int = Field(..., description="Number of travelers", ge=1)
     num_days: int = Field(..., description="Number of days at destination (excluding flight days)", ge=1)
     budget_per_person: float = Field(..., description="Budget per person in USD")
     additional_details: Optional[List[str]] = Field(
-        default=[],
+        default_factory=list,
         description="Additional user preferences/constraints"
     )
     
@@ -248,14 +316,32 @@ class Phase3Input(BaseModel):
     selected_activities: List[Activity] = Field(..., description="Activities user wants to include")
 
 
-class DayPlan(BaseModel):
-    """Single day in the itinerary"""
-    day_number: int = Field(..., description="Day number (1, 2, 3, etc.)")
-    date: str = Field(..., description="Date (YYYY-MM-DD)")
-    title: str = Field(..., description="Title for the day (e.g., 'Arrival & Exploration')")
-    activities: List[str] = Field(..., description="List of activities for this day")
-    meals: Optional[List[str]] = Field(default=[], description="Meal suggestions")
-    notes: Optional[str] = Field(default="", description="Additional notes or tips for the day")
+@dataclass(slots=True, frozen=True)
+class DayPlan:
+    """
+    Single day in the itinerary.
+    A slotted dataclass rather than a model: it's only built by the Phase 3 parser
+    from already-typed values, and pydantic still validates/serializes it as a field.
+    """
+    # Reject stray fields if one is ever validated from a dict
+    __pydantic_config__ = ConfigDict(extra='forbid')
+
+    day_number: Annotated[int, Field(description="Day number (1, 2, 3, etc.)")]
+    date: Annotated[str, Field(description="Date (YYYY-MM-DD)")]
+    title: Annotated[str, Field(description="Title for the day (e.g., 'Arrival & Exploration')")]
+    activities: Annotated[List[str], Field(description="List of activities for this day")]
+    meals: Annotated[List[str], Field(description="Meal suggestions")] = field(default_factory=list)
+    notes: Annotated[str, Field(description="Additional notes or tips for the day")] = ""
+
+
+class CostBreakdown(BaseModel):
+    """Whole-trip cost per category in USD (fixed keys; serializes like the old dict)"""
+    model_config = _FAST_CONFIG
+
+    flights: float = 0.0
+    hotel: float = 0.0
+    activities: float = 0.0
+    meals_and_misc: float = 0.0
 
 
 class Phase3Response(BaseModel):
@@ -267,7 +353,9 @@ class Phase3Response(BaseModel):
     - Selected flights, hotel, activities
     - Budget breakdown
     """
-    status: str = Field(..., description="success, partial, or error")
+    model_config = _CONTAINER
+
+    status: Status = Field(..., description="success, partial, or error")
     
     # Trip summary
     destination: str
@@ -285,12 +373,56 @@ class Phase3Response(BaseModel):
     
     # Budget
     total_cost: float = Field(..., description="Total estimated cost for entire trip")
-    cost_breakdown: Dict[str, float] = Field(
+    cost_breakdown: CostBreakdown = Field(
         ...,
-        description="Breakdown: flights, hotel, activities, meals, misc"
+        description="Breakdown: flights, hotel, activities, meals and misc"
     )
     
     # Metadata
     created_at: str = Field(..., description="Timestamp when itinerary was created")
     errors: List[str] = Field(default_factory=list)
-    warnings: List[str] = Field(default_factory=list)
\ No newline at end of file
+    warnings: List[str] = Field(default_factory=list)
+
+
+def warmup_models() -> None:
+    """Build the deferred core schemas for every model up front (called once at startup)."""
+    for model in (
+        TripDuration,
+        TripDetails,
+        PreliminarySuggestions,
+        SelectedDestination,
+        TripContext,
+        Phase2PlanningRequest,
+        ActivityFinderRequest,
+        Activity,
+        ActivitySearchResults,
+        FlightOption,
+        FlightRecommendations,
+        HotelOption,
+        HotelRecommendations,
+        Phase2Response,
+        Phase3Input,
+        CostBreakdown,
+        Phase3Response,
+    ):
+        model.model_rebuild()
+
+
+# ========================================
+# JSON parsing helpers
+# ========================================
+
+@lru_cache(maxsize=None)
+def _adapter(model: type) -> TypeAdapter:
+    """One TypeAdapter per model, built on first use (keeps defer_build effective at import)."""
+    return TypeAdapter(model)
+
+
+def parse_preliminary_suggestions(raw: Union[str, bytes]) -> PreliminarySuggestions:
+    """Parse and validate the Location Finder's JSON in one pass."""
+    return _adapter(PreliminarySuggestions).validate_json(raw)
+
+
+def parse_activity_search_results(raw: Union[str, bytes]) -> ActivitySearchResults:
+    """Parse and validate the Activity Finder's JSON in one pass."""
+    return _adapter(ActivitySearchResults).validate_json(raw)
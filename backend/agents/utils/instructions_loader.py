@@ -1,15 +1,24 @@
 # agents/utils/instructions_loader.py
 
-import inspect
+import sys
+from functools import lru_cache
 from pathlib import Path
 
+
+@lru_cache(maxsize=64)
+def _read_file(path: Path) -> str:
+    """Read and strip an instruction file; cached since the files don't change at runtime."""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
 def load_instruction_from_file(filename: str, relative_to_caller: bool = True) -> str:
     """
     Load instruction text from a file.
     """
     if relative_to_caller:
-        caller_frame = inspect.stack()[1]
-        caller_file = caller_frame.filename
+        # Just the immediate caller's frame (inspect.stack() would build every frame's info)
+        caller_file = sys._getframe(1).f_code.co_filename
         caller_dir = Path(caller_file).parent
         file_path = caller_dir / filename
     else:
@@ -17,8 +26,7 @@ def load_instruction_from_file(filename: str, relative_to_caller: bool = True) -
         file_path = project_root / "instructions" / filename
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            instructions = f.read().strip()
+        instructions = _read_file(file_path.resolve())
 
         if not instructions:
             raise ValueError(f"Instruction file '{filename}' is empty.")
@@ -0,0 +1,33 @@
+# agents/utils/request_cache.py
+
+"""
+Short-lived exact-match caches for the expensive phase endpoints.
+
+Phase 1 search and Phase 2 planning run LLM agents and scrapers, so an
+identical request repeated within a few minutes (re-submit, frontend retry)
+is served from memory instead of re-running the pipeline.
+"""
+
+from hashlib import blake2b
+
+import orjson
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+# Defaults: a few hundred distinct requests, each kept for 15 minutes
+DEFAULT_MAXSIZE = 512
+DEFAULT_TTL_SECONDS = 900
+
+
+def make_response_cache(maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL_SECONDS) -> TTLCache:
+    """Create a bounded TTL cache for phase results (single event loop, no locking needed)."""
+    return TTLCache(maxsize=maxsize, ttl=ttl)
+
+
+def request_key(req: BaseModel) -> str:
+    """
+    Canonical key for a request: every field, serialized with sorted keys and hashed,
+    so equal requests map to the same key regardless of field order.
+    """
+    payload = orjson.dumps(req.model_dump(mode="json"), option=orjson.OPT_SORT_KEYS)
+    return blake2b(payload, digest_size=16).hexdigest()
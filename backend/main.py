@@ -1,16 +1,73 @@
+import asyncio
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Log records are handed off to a background thread so handler I/O
+# never blocks the event loop
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+# QueueHandler.prepare() bakes its formatted message into the record; keep that to the
+# bare message so only the listener's formatter adds the timestamp/level/name prefix
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[_queue_handler],
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 from routes.health import router as health_router
 from routes.phase1 import router as phase1_router
 from routes.ratings import router as ratings_router  
 from routes.phase2 import router as phase2_router
 from routes.phase3 import router as phase3_router 
+from agents.utils.data_models import warmup_models
+from tools.activity_search import aclose_async_client, prewarm_async_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models defer their schema builds; do them here rather than on the first request
+    if os.getenv("WARMUP_MODELS", "1") != "0":
+        await asyncio.to_thread(warmup_models)
+    # Connect to Tavily in the background; startup doesn't wait on the network
+    prewarm_task = asyncio.create_task(prewarm_async_client())
+    
+    # PDFs render in a worker thread by default; PDF_WORKERS=N opts into a process pool.
+    # Workers are spawned, not forked: this process already runs the log listener and
+    # httpx threads, and a forked child could inherit a lock held by one of them
+    pdf_workers = int(os.getenv("PDF_WORKERS", "0"))
+    app.state.pdf_pool = (
+        ProcessPoolExecutor(max_workers=pdf_workers, mp_context=multiprocessing.get_context("spawn"))
+        if pdf_workers > 0 else None
+    )
+    try:
+        yield
+    finally:
+        if app.state.pdf_pool is not None:
+            app.state.pdf_pool.shutdown(cancel_futures=True)
+        prewarm_task.cancel()
+        await aclose_async_client()
+
 
-app = FastAPI()
+# orjson for every dict/model a handler returns (handlers returning Response are untouched)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,7 @@
 # backend/routes/activity_finder.py
 
 from typing import List
+import logging
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
@@ -9,6 +10,8 @@ from agents.phase2.activity_finder.supervisor import activity_finder_supervisor
 
 router = APIRouter(prefix="/activity-finder", tags=["activity-finder"])
 
+logger = logging.getLogger(__name__)
+
 
 @router.post("/search")
 async def search_activities(req: ActivityFinderRequest):
@@ -30,9 +33,7 @@ async def search_activities(req: ActivityFinderRequest):
         return result
         
     except Exception as e:
-        print(f"[Activity Finder Route] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Activity Finder Route] Error: %s", e)
         
         raise HTTPException(
             status_code=500,
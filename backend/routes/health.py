@@ -1,7 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+import orjson
 
 router = APIRouter(prefix="/health")
 
+# Static payload, serialized once
+_HEALTH_BYTES = orjson.dumps({"status": "backend is running!"})
+
 @router.get("/")
 def check_health():
-    return {"status": "backend is running!"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
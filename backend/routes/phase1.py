@@ -2,16 +2,20 @@
 
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field
+from datetime import date
 
 from agents.phase1.supervisor import phase1_supervisor
+from agents.utils.request_cache import make_response_cache, request_key
 
 router = APIRouter(prefix="/phase1", tags=["phase1"])
 
 # Global storage for the last search request
 LAST_SEARCH_REQUEST: Dict[str, Any] = {}
 
+# Successful supervisor results keyed by the enriched request
+PHASE1_CACHE = make_response_cache()
+
 
 class SearchRequest(BaseModel):
     location: str
@@ -21,7 +25,7 @@ class SearchRequest(BaseModel):
     dateMode: str                        # always "date_range" in your use-case now
     startDate: str                       # "YYYY-MM-DD"
     endDate: str                        # "YYYY-MM-DD"
-    additionalDetails: Optional[List[str]] = []
+    additionalDetails: Optional[List[str]] = Field(default_factory=list)
 
     # Computed server-side fields
     budget_per_person: Optional[float] = None
@@ -46,24 +50,30 @@ async def search_locations(req: SearchRequest):
 
     # 2. Compute numDays from date difference
    
-    start = datetime.strptime(req.startDate, "%Y-%m-%d")
-    end = datetime.strptime(req.endDate, "%Y-%m-%d")
+    start = date.fromisoformat(req.startDate)
+    end = date.fromisoformat(req.endDate)
     day_diff = (end - start).days
     numDays = max(day_diff - 2, 0)   # ensure it's never negative
 
-    # 3. Build stored request with computed fields included
+    # 3. Build enriched request with computed fields included
+    #    (model_copy: the input is already validated, no need to rebuild it)
    
-    stored_req = req.dict()
-    stored_req["budget_per_person"] = budget_per_person
-    stored_req["numDays"] = numDays
+    enriched_req = req.model_copy(update={
+        "budget_per_person": budget_per_person,
+        "numDays": numDays,
+    })
 
     # Save for future access
-    LAST_SEARCH_REQUEST = stored_req
+    LAST_SEARCH_REQUEST = enriched_req.model_dump()
 
-    # 4. Pass enriched request to supervisor
+    # 4. Pass enriched request to supervisor (unless an identical search was just served)
    
-    enriched_req = SearchRequest(**stored_req)
-    result = await phase1_supervisor.run(enriched_req)
+    cache_key = request_key(enriched_req)
+    result = PHASE1_CACHE.get(cache_key)
+    if result is None:
+        result = await phase1_supervisor.run(enriched_req)
+        if "error" not in result:
+            PHASE1_CACHE[cache_key] = result
 
    
     # 5. Return response structure required by frontend
@@ -81,6 +91,13 @@ async def search_locations(req: SearchRequest):
     return response
 
 
+@router.delete("/cache")
+async def clear_search_cache():
+    """Drop all cached Phase 1 search results."""
+    PHASE1_CACHE.clear()
+    return {"success": True, "message": "Phase 1 cache cleared"}
+
+
 @router.get("/last-search")
 async def get_last_search():
     """Retrieve the last stored user search input."""
@@ -1,9 +1,12 @@
 # backend/routes/phase2.py
 
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from datetime import datetime
+import logging
+import orjson
 
 from agents.utils.data_models import (
     SelectedDestination,
@@ -12,12 +15,35 @@ from agents.utils.data_models import (
     Phase2Response  # 
 )
 from agents.phase2.supervisor import phase2_supervisor
+from agents.utils.request_cache import make_response_cache, request_key
 
 router = APIRouter(prefix="/phase2", tags=["phase2"])
 
+logger = logging.getLogger(__name__)
 
-@router.post("/plan")
-async def plan_itinerary(request: Phase2PlanningRequest) -> Phase2Response:  # ← FIXED
+# Successful plans keyed by the full request (destination, trip context, preferences)
+PHASE2_CACHE = make_response_cache()
+
+# Identical plan requests that arrive while one is already running share its result
+# (e.g. double-submits / frontend retries) instead of starting another agent pipeline
+_INFLIGHT: Dict[str, "asyncio.Task[Phase2Response]"] = {}
+
+
+async def _run_coalesced(request: Phase2PlanningRequest, key: str) -> Phase2Response:
+    """Run the Phase 2 supervisor once per distinct in-flight request (key: request_key)."""
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(phase2_supervisor.run(request))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # shield: one caller disconnecting must not cancel the run the others are waiting on
+    return await asyncio.shield(task)
+
+
+# response_model documents the schema; the handler returns pre-serialized JSON so
+# FastAPI doesn't re-validate and re-encode the (large, already validated) response
+@router.post("/plan", response_model=Phase2Response)
+async def plan_itinerary(request: Phase2PlanningRequest) -> Response:
     """
     Phase 2: Generate complete itinerary including flights, hotels, and activities.
     
@@ -42,25 +68,33 @@ async def plan_itinerary(request: Phase2PlanningRequest) -> Phase2Response:  # 
     - estimated_total_cost: Rough cost estimate
     """
     
-    print(f"[Phase2] ===== Starting Itinerary Planning =====")
-    print(f"[Phase2] Destination: {request.selected_destination.destination}, {request.selected_destination.country}")
-    print(f"[Phase2] Origin: {request.trip_context.origin_location}")
-    print(f"[Phase2] Dates: {request.trip_context.startDate} to {request.trip_context.endDate}")
-    print(f"[Phase2] Travelers: {request.trip_context.numTravelers}")
-    print(f"[Phase2] Budget per person: ${request.trip_context.budget_per_person}")
-    print(f"[Phase2] Recommended Activities: {len(request.selected_destination.recommended_activities)}")
+    logger.debug(
+        "[Phase2] Starting Itinerary Planning: destination=%s, %s origin=%s dates=%s to %s "
+        "travelers=%s budget_per_person=$%s recommended_activities=%d",
+        request.selected_destination.destination,
+        request.selected_destination.country,
+        request.trip_context.origin_location,
+        request.trip_context.startDate,
+        request.trip_context.endDate,
+        request.trip_context.numTravelers,
+        request.trip_context.budget_per_person,
+        len(request.selected_destination.recommended_activities),
+    )
     
     try:
         # Call Phase 2 Supervisor
-        result = await phase2_supervisor.run(request)
-        return result
+        cache_key = request_key(request)
+        result = PHASE2_CACHE.get(cache_key)
+        if result is None:
+            result = await _run_coalesced(request, cache_key)
+            if result.status != "error":
+                PHASE2_CACHE[cache_key] = result
+        return Response(content=result.model_dump_json(), media_type="application/json")
         
     except Exception as e:
-        print(f"[Phase2] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Phase2] Error: %s", e)
         
-        return Phase2Response(
+        error_response = Phase2Response(
             status="error",
             activities=None,
             flights=None,
@@ -69,18 +103,30 @@ async def plan_itinerary(request: Phase2PlanningRequest) -> Phase2Response:  # 
             errors=[str(e)],
             warnings=[]
         )
+        return Response(content=error_response.model_dump_json(), media_type="application/json")
+
+
+# Static payload, serialized once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "Phase 2 routes active",
+    "endpoints": ["/plan"],
+    "agents": {
+        "activity_planner": "pending",
+        "airport_finder": "pending",
+        "flight_scraper": "pending",
+        "hotel_finder": "pending"
+    }
+})
+
+
+@router.delete("/cache")
+async def clear_plan_cache():
+    """Drop all cached Phase 2 plans."""
+    PHASE2_CACHE.clear()
+    return {"success": True, "message": "Phase 2 cache cleared"}
 
 
 @router.get("/health")
 async def phase2_health():
     """Health check for Phase 2 routes"""
-    return {
-        "status": "Phase 2 routes active",
-        "endpoints": ["/plan"],
-        "agents": {
-            "activity_planner": "pending",
-            "airport_finder": "pending",
-            "flight_scraper": "pending",
-            "hotel_finder": "pending"
-        }
-    }
\ No newline at end of file
+    return Response(_HEALTH_BYTES, media_type="application/json")
@@ -1,12 +1,18 @@
 # backend/routes/phase3.py
 
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from functools import lru_cache
 from io import BytesIO
+from types import SimpleNamespace
+import asyncio
+import importlib.util
+import logging
 import os
 import re
+import orjson
 
 from agents.utils.data_models import (
     Phase3Input,
@@ -16,21 +22,126 @@ from agents.phase3.supervisor import phase3_supervisor, ITINERARY_STORAGE
 
 router = APIRouter(prefix="/phase3", tags=["phase3"])
 
-try:
-    from reportlab.lib.pagesizes import letter, A4
+logger = logging.getLogger(__name__)
+
+# Destination → download filename: spaces to underscores, commas dropped, in one C-level pass
+_FILENAME_TABLE = str.maketrans({' ': '_', ',': None})
+
+# Times / time ranges to bold in the PDF's daily plan (e.g. "12:05 PM", "12:05 pm - 1:30 PM")
+_TIME_RE = re.compile(
+    r'(\d{1,2}:\d{2}\s*(?:AM|PM)(?:\s*-\s*\d{1,2}:\d{2}\s*(?:AM|PM))?)',
+    re.IGNORECASE,
+)
+
+# reportlab (fonts, PIL, ...) is only imported when the first PDF is generated;
+# at import time just check that it's installed
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+if not REPORTLAB_AVAILABLE:
+    logger.warning("[Phase3] reportlab not installed. PDF generation will not work.")
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles() -> SimpleNamespace:
+    """
+    Import reportlab and build the PDF styles on first use.
+    Styles are immutable once built, so they're shared across PDFs.
+    """
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.platypus import TableStyle
     from reportlab.lib import colors
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    print("[Phase3] Warning: reportlab not installed. PDF generation will not work.")
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+    title = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e293b'),
+        spaceAfter=12,
+        alignment=TA_CENTER
+    )
+    heading = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#3b82f6'),
+        spaceAfter=10,
+        spaceBefore=15
+    )
+    subheading = ParagraphStyle(
+        'CustomSubheading',
+        parent=styles['Heading3'],
+        fontSize=13,
+        textColor=colors.HexColor('#475569'),
+        spaceAfter=8
+    )
+    normal = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=colors.HexColor('#1e293b'),
+        spaceAfter=6
+    )
+    summary_table = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0'))
+    ])
+    flight_table = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0'))
+    ])
+    cost_table = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -2), 10),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),  # Total row already bold via TableStyle
+        ('FONTSIZE', (0, -1), (-1, -1), 12),
+        ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#3b82f6')),
+        ('GRID', (0, 0), (-1, -2), 1, colors.HexColor('#e2e8f0'))
+    ])
+    # Tuples so the shared widths can't be mutated; Table gets a fresh list each time
+    summary_col_widths = (2*inch, 2*inch, 2*inch)
+    flight_col_widths = (1*inch, 1.5*inch, 1.5*inch, 1.5*inch, 1*inch)
+    cost_col_widths = (4*inch, 2*inch)
+
+    return SimpleNamespace(
+        title=title,
+        heading=heading,
+        subheading=subheading,
+        normal=normal,
+        summary_table=summary_table,
+        flight_table=flight_table,
+        cost_table=cost_table,
+        summary_col_widths=summary_col_widths,
+        flight_col_widths=flight_col_widths,
+        cost_col_widths=cost_col_widths,
+    )
 
 
-@router.post("/create-itinerary")
-async def create_itinerary(request: Phase3Input) -> Phase3Response:
+# response_model documents the schema; the handler returns pre-serialized JSON so
+# FastAPI doesn't re-validate and re-encode the already built itinerary
+@router.post("/create-itinerary", response_model=Phase3Response)
+async def create_itinerary(request: Phase3Input) -> Response:
     """
     Phase 3: Create final day-by-day itinerary.
     
@@ -50,74 +161,49 @@ async def create_itinerary(request: Phase3Input) -> Phase3Response:
     - Selected flights, hotel, activities
     """
     
-    print(f"[Phase3] ===== Starting Itinerary Creation =====")
-    print(f"[Phase3] Destination: {request.destination}")
-    print(f"[Phase3] Dates: {request.trip_start_date} to {request.trip_end_date}")
-    print(f"[Phase3] Travelers: {request.num_travelers}")
-    print(f"[Phase3] Selected Activities: {len(request.selected_activities)}")
+    logger.debug(
+        "[Phase3] Starting Itinerary Creation: destination=%s dates=%s to %s travelers=%s selected_activities=%d",
+        request.destination,
+        request.trip_start_date,
+        request.trip_end_date,
+        request.num_travelers,
+        len(request.selected_activities),
+    )
     
     try:
         # Call Phase 3 Supervisor
         result = await phase3_supervisor.run(request)
-        return result
+        return Response(content=result.model_dump_json(), media_type="application/json")
         
     except Exception as e:
-        print(f"[Phase3] Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Phase3] Error: %s", e)
         
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def generate_itinerary_pdf(itinerary: Phase3Response) -> BytesIO:
+def generate_itinerary_pdf(itinerary: Phase3Response) -> bytes:
     """
     Generate a beautifully formatted PDF from itinerary data.
+    Blocking (reportlab is CPU-bound); call it from a worker thread or process.
     """
     if not REPORTLAB_AVAILABLE:
         raise HTTPException(status_code=500, detail="PDF generation not available (reportlab not installed)")
     
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    
+    st = _pdf_styles()
+    
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
     
     # Container for PDF elements
     elements = []
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1e293b'),
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#3b82f6'),
-        spaceAfter=10,
-        spaceBefore=15
-    )
-    subheading_style = ParagraphStyle(
-        'CustomSubheading',
-        parent=styles['Heading3'],
-        fontSize=13,
-        textColor=colors.HexColor('#475569'),
-        spaceAfter=8
-    )
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#1e293b'),
-        spaceAfter=6
-    )
-    
     # Title
-    elements.append(Paragraph(f"<b>{itinerary.destination}</b>", title_style))
-    elements.append(Paragraph(f"<i>{itinerary.dates}</i>", normal_style))
+    elements.append(Paragraph(f"<b>{itinerary.destination}</b>", st.title))
+    elements.append(Paragraph(f"<i>{itinerary.dates}</i>", st.normal))
     elements.append(Spacer(1, 0.3*inch))
     
     # Trip Summary
@@ -125,24 +211,13 @@ def generate_itinerary_pdf(itinerary: Phase3Response) -> BytesIO:
         ['Travelers', 'Duration', 'Total Cost'],
         [str(itinerary.num_travelers), f"{len(itinerary.daily_plans)} days", f"${itinerary.total_cost:,.2f}"]
     ]
-    summary_table = Table(summary_data, colWidths=[2*inch, 2*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 11),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0'))
-    ]))
+    summary_table = Table(summary_data, colWidths=list(st.summary_col_widths))
+    summary_table.setStyle(st.summary_table)
     elements.append(summary_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # Flights
-    elements.append(Paragraph("<b>✈️ Flights</b>", heading_style))
+    elements.append(Paragraph("<b>✈️ Flights</b>", st.heading))
     flight_data = [
         ['Direction', 'Route', 'Departure', 'Arrival', 'Price'],
         [
@@ -160,83 +235,65 @@ def generate_itinerary_pdf(itinerary: Phase3Response) -> BytesIO:
             f"${itinerary.return_flight.price_usd:,.2f}"
         ]
     ]
-    flight_table = Table(flight_data, colWidths=[1*inch, 1.5*inch, 1.5*inch, 1.5*inch, 1*inch])
-    flight_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0'))
-    ]))
+    flight_table = Table(flight_data, colWidths=list(st.flight_col_widths))
+    flight_table.setStyle(st.flight_table)
     elements.append(flight_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # Hotel
-    elements.append(Paragraph("<b>🏨 Accommodation</b>", heading_style))
-    elements.append(Paragraph(f"<b>{itinerary.hotel.name}</b>", subheading_style))
-    elements.append(Paragraph(f"⭐ {itinerary.hotel.rating}/5 ({itinerary.hotel.reviews} reviews) - ${itinerary.hotel.price:,.2f} per night", normal_style))
+    elements.append(Paragraph("<b>🏨 Accommodation</b>", st.heading))
+    elements.append(Paragraph(f"<b>{itinerary.hotel.name}</b>", st.subheading))
+    elements.append(Paragraph(f"⭐ {itinerary.hotel.rating}/5 ({itinerary.hotel.reviews} reviews) - ${itinerary.hotel.price:,.2f} per night", st.normal))
     elements.append(Spacer(1, 0.2*inch))
     
     # Daily Itinerary
-    elements.append(Paragraph("<b>📋 Day-by-Day Itinerary</b>", heading_style))
+    elements.append(Paragraph("<b>📋 Day-by-Day Itinerary</b>", st.heading))
     for day in itinerary.daily_plans:
-        elements.append(Paragraph(f"<b>Day {day.day_number} - {day.date}</b>", subheading_style))
-        for activity in day.activities:
-            # Try to bold times and key parts
-            formatted_activity = activity
-            # Bold times (e.g., "12:05 PM", "12:05 PM - 1:30 PM")
-            formatted_activity = re.sub(
-                r'(\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)(?:\s*-\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm))?)',
-                r'<b>\1</b>',
-                formatted_activity
+        elements.append(Paragraph(f"<b>Day {day.day_number} - {day.date}</b>", st.subheading))
+        # All of a day's bullets in one Paragraph (one flowable for reportlab to lay out),
+        # with times bolded (e.g., "12:05 PM", "12:05 PM - 1:30 PM")
+        if day.activities:
+            day_html = "<br/>".join(
+                "• " + _TIME_RE.sub(r'<b>\1</b>', activity) for activity in day.activities
             )
-            elements.append(Paragraph(f"• {formatted_activity}", normal_style))
+            elements.append(Paragraph(day_html, st.normal))
         elements.append(Spacer(1, 0.15*inch))
     
     # Cost Breakdown
     elements.append(Spacer(1, 0.2*inch))
-    elements.append(Paragraph("<b>💰 Cost Breakdown</b>", heading_style))
+    elements.append(Paragraph("<b>💰 Cost Breakdown</b>", st.heading))
     cost_data = [['Category', 'Amount']]
-    for key, value in itinerary.cost_breakdown.items():
+    for key, value in itinerary.cost_breakdown.model_dump().items():
         label = key.replace('_', ' ').title()
         cost_data.append([label, f"${value:,.2f}"])
     cost_data.append(['Total', f"${itinerary.total_cost:,.2f}"])
     
-    cost_table = Table(cost_data, colWidths=[4*inch, 2*inch])
-    cost_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -2), 10),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),  # Total row already bold via TableStyle
-        ('FONTSIZE', (0, -1), (-1, -1), 12),
-        ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#3b82f6')),
-        ('GRID', (0, 0), (-1, -2), 1, colors.HexColor('#e2e8f0'))
-    ]))
+    cost_table = Table(cost_data, colWidths=list(st.cost_col_widths))
+    cost_table.setStyle(st.cost_table)
     elements.append(cost_table)
     
-    # Build PDF
+    # Build PDF (reportlab writes the whole file at the end of build)
     doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
+
+
+def _render_pdf(itinerary_data: Dict[str, Any]) -> bytes:
+    """Process-pool entry point: rebuild the itinerary from its dump and render it."""
+    return generate_itinerary_pdf(Phase3Response.model_validate(itinerary_data))
 
 
 @router.get("/download-pdf")
-async def download_itinerary_pdf(created_at: str = Query(..., description="Timestamp of the itinerary")):
+async def download_itinerary_pdf(
+    request: Request,
+    created_at: str = Query(..., description="Timestamp of the itinerary"),
+):
     """
     Download itinerary as PDF.
     
     Query parameter:
     - created_at: The timestamp (ISO format) when the itinerary was created
     """
-    print(f"[Phase3] PDF download requested for itinerary: {created_at}")
+    logger.debug("[Phase3] PDF download requested for itinerary: %s", created_at)
     
     # Retrieve itinerary from storage
     if created_at not in ITINERARY_STORAGE:
@@ -244,36 +301,47 @@ async def download_itinerary_pdf(created_at: str = Query(..., description="Times
     
     itinerary = ITINERARY_STORAGE[created_at]
     
+    if not REPORTLAB_AVAILABLE:
+        raise HTTPException(status_code=500, detail="PDF generation not available (reportlab not installed)")
+    
     try:
-        # Generate PDF
-        pdf_buffer = generate_itinerary_pdf(itinerary)
+        # Generate PDF off the event loop: in the app's process pool when there is one
+        # (CPU-bound, so PDFs render in parallel across cores), else in a worker thread
+        pdf_pool = getattr(request.app.state, "pdf_pool", None)
+        if pdf_pool is not None:
+            pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+                pdf_pool, _render_pdf, itinerary.model_dump()
+            )
+        else:
+            pdf_bytes = await asyncio.to_thread(generate_itinerary_pdf, itinerary)
         
         # Create filename
-        destination_name = itinerary.destination.replace(' ', '_').replace(',', '')
+        destination_name = itinerary.destination.translate(_FILENAME_TABLE)
         filename = f"itinerary_{destination_name}.pdf"
         
-        return StreamingResponse(
-            pdf_buffer,
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
         
     except Exception as e:
-        print(f"[Phase3] PDF generation error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Phase3] PDF generation error: %s", e)
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
 
 
+# Static payload (reportlab availability is fixed at import), serialized once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "Phase 3 routes active",
+    "endpoints": ["/create-itinerary", "/download-pdf"],
+    "agents": {
+        "itinerary_planner": "ready"
+    },
+    "pdf_generation": "available" if REPORTLAB_AVAILABLE else "unavailable"
+})
+
+
 @router.get("/health")
 async def phase3_health():
     """Health check for Phase 3 routes"""
-    return {
-        "status": "Phase 3 routes active",
-        "endpoints": ["/create-itinerary", "/download-pdf"],
-        "agents": {
-            "itinerary_planner": "ready"
-        },
-        "pdf_generation": "available" if REPORTLAB_AVAILABLE else "unavailable"
-    }
-
+    return Response(_HEALTH_BYTES, media_type="application/json")
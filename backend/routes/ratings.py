@@ -1,15 +1,57 @@
 # backend/routes/ratings.py
 
-from typing import List
-from fastapi import APIRouter
+from collections import deque
+from typing import Any, Deque, Dict, List
+import logging
+import threading
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter(prefix="/ratings", tags=["ratings"])
 
-# In-memory storage (replace with database later)
-preferred_destinations = []
-unpreferred_destinations = []
+logger = logging.getLogger(__name__)
+
+# Cap per list so a long-running server can't grow without bound (oldest dropped first)
+MAX_RATINGS = 10_000
+
+
+class RatingsStore:
+    """
+    In-memory ratings storage (replace with database later).
+    A lock guards every read/write so handlers can run concurrently
+    (event loop or threadpool) without racing on the lists.
+    """
+
+    def __init__(self, maxlen: int = MAX_RATINGS):
+        self._lock = threading.Lock()
+        self._preferred: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self._unpreferred: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def add(self, rating: Dict[str, Any], preferred: bool) -> None:
+        with self._lock:
+            (self._preferred if preferred else self._unpreferred).append(rating)
+
+    def preferred(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._preferred)
+
+    def unpreferred(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._unpreferred)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._preferred.clear()
+            self._unpreferred.clear()
+
+
+_ratings_store = RatingsStore()
+
+
+def get_ratings_store() -> RatingsStore:
+    """FastAPI dependency for the ratings store (override to swap in another backend)."""
+    return _ratings_store
 
 
 class RatingData(BaseModel):
@@ -23,7 +65,7 @@ class RatingData(BaseModel):
 
 
 @router.post("/store")
-async def store_rating(rating_data: RatingData):
+def store_rating(rating_data: RatingData, store: RatingsStore = Depends(get_ratings_store)):
     """
     Store user rating for a destination.
     Rating >= 5 goes to preferred, < 5 goes to unpreferred.
@@ -33,14 +75,11 @@ async def store_rating(rating_data: RatingData):
     
     rating_dict = rating_data.dict()
     
-    if rating_data.rating >= 5:
-        preferred_destinations.append(rating_dict)
-        category = "preferred"
-    else:
-        unpreferred_destinations.append(rating_dict)
-        category = "unpreferred"
+    is_preferred = rating_data.rating >= 5
+    store.add(rating_dict, preferred=is_preferred)
+    category = "preferred" if is_preferred else "unpreferred"
     
-    print(f"[Ratings] Stored {category} destination: {rating_data.destination} with rating {rating_data.rating}")
+    logger.debug("[Ratings] Stored %s destination: %s with rating %s", category, rating_data.destination, rating_data.rating)
     
     return {
         "success": True,
@@ -51,8 +90,9 @@ async def store_rating(rating_data: RatingData):
 
 
 @router.get("/preferred")
-async def get_preferred_destinations():
+def get_preferred_destinations(store: RatingsStore = Depends(get_ratings_store)):
     """Get all preferred destinations (rating >= 5)"""
+    preferred_destinations = store.preferred()
     return {
         "count": len(preferred_destinations),
         "destinations": preferred_destinations,
@@ -60,8 +100,9 @@ async def get_preferred_destinations():
 
 
 @router.get("/unpreferred")
-async def get_unpreferred_destinations():
+def get_unpreferred_destinations(store: RatingsStore = Depends(get_ratings_store)):
     """Get all unpreferred destinations (rating < 5)"""
+    unpreferred_destinations = store.unpreferred()
     return {
         "count": len(unpreferred_destinations),
         "destinations": unpreferred_destinations,
@@ -69,8 +110,10 @@ async def get_unpreferred_destinations():
 
 
 @router.get("/all")
-async def get_all_ratings():
+def get_all_ratings(store: RatingsStore = Depends(get_ratings_store)):
     """Get all ratings for analysis"""
+    preferred_destinations = store.preferred()
+    unpreferred_destinations = store.unpreferred()
     return {
         "preferred_count": len(preferred_destinations),
         "unpreferred_count": len(unpreferred_destinations),
@@ -80,9 +123,7 @@ async def get_all_ratings():
 
 
 @router.delete("/clear")
-async def clear_all_ratings():
+def clear_all_ratings(store: RatingsStore = Depends(get_ratings_store)):
     """Clear all stored ratings (for testing)"""
-    global preferred_destinations, unpreferred_destinations
-    preferred_destinations = []
-    unpreferred_destinations = []
+    store.clear()
     return {"success": True, "message": "All ratings cleared"}
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Retry classification for the sync Tavily search path."""
+
+import pytest
+
+pytest.importorskip("httpx")
+tavily_errors = pytest.importorskip("tavily.errors")
+requests = pytest.importorskip("requests")
+
+from tools import activity_search  # noqa: E402
+
+
+class FlakyClient:
+    """Raises `error` on the first search, then succeeds."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+        self.calls = 0
+
+    def search(self, **params):
+        self.calls += 1
+        if self.calls == 1:
+            raise self.error
+        return {"results": [{"title": "ok", "content": "found", "url": "", "score": 1.0}]}
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        tavily_errors.TimeoutError(10),
+        tavily_errors.UsageLimitExceededError("rate limited"),
+        requests.exceptions.ConnectionError(),
+        requests.exceptions.Timeout(),
+    ],
+    ids=lambda e: type(e).__name__,
+)
+def test_sync_search_retries_transient_errors(monkeypatch, error):
+    client = FlakyClient(error)
+    monkeypatch.setattr(activity_search, "_client", client)
+    monkeypatch.setattr(activity_search, "_cache", activity_search.OrderedDict())
+    monkeypatch.setattr(activity_search.time, "sleep", lambda _: None)
+
+    results = activity_search.tavily_search_activities(f"retry {type(error).__name__}")
+
+    assert client.calls == 2
+    assert [r.title for r in results] == ["ok"]
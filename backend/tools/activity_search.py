@@ -2,57 +2,426 @@
 Tavily search tool for activity research.
 """
 
+import asyncio
+import logging
 import os
-from typing import List, Dict, Any
-from tavily import TavilyClient
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Dict, Any, Literal, Optional, Tuple
 
+import httpx
 
-def tavily_search_activities(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+# Network-level failures worth retrying (HTTP status codes are checked separately)
+_RETRYABLE_ERRORS: Tuple[type, ...] = (httpx.TransportError, ConnectionError, TimeoutError)
+
+# tavily-python is only needed for the sync path; the async path talks to the API directly
+try:
+    from tavily import TavilyClient
+    from tavily.errors import TimeoutError as TavilyTimeoutError, UsageLimitExceededError
+    import requests
+
+    # The SDK wraps timeouts and rate limits in its own classes (no .response to inspect),
+    # and lets raw requests connection errors through
+    _RETRYABLE_ERRORS += (
+        TavilyTimeoutError,
+        UsageLimitExceededError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    )
+except ImportError:
+    TavilyClient = None
+
+logger = logging.getLogger(__name__)
+
+_TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Read once; main.py loads .env before this module is imported
+_API_KEY = os.environ.get("TAVILY_API_KEY")
+
+# Rate limiting and transient server errors are retried; anything else (e.g. bad key) fails fast
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 3
+
+# Per-request timeout (seconds); low enough that one slow search can't stall an agent turn
+DEFAULT_TIMEOUT = 10.0
+
+# Result text goes straight into the LLM's context; keep it short unless asked otherwise
+DEFAULT_CONTENT_MAX_CHARS = 400
+
+SearchDepth = Literal["basic", "advanced"]
+
+# Queries that ask for comparison/synthesis are worth the slower, pricier "advanced" search
+_ADVANCED_WORDS = frozenset({"best", "compare", "comparison", "vs", "versus"})
+_ADVANCED_MIN_WORDS = 9
+
+# One client for the process, created on first search
+_client: Optional["TavilyClient"] = None
+
+# Worker threads for fanning out sync searches (threads are started on first use)
+_pool = ThreadPoolExecutor(max_workers=10, thread_name_prefix="tavily")
+
+# Pooled keep-alive connections shared by every async search on the event loop
+_aclient: Optional[httpx.AsyncClient] = None
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """One Tavily hit (or the generated summary / an error placeholder)."""
+    title: str
+    content: str
+    url: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _api_key() -> str:
+    if not _API_KEY:
+        raise RuntimeError("TAVILY_API_KEY not set")
+    return _API_KEY
+
+
+def _get_client() -> "TavilyClient":
+    """Return the shared TavilyClient, creating it (and checking the API key) once."""
+    global _client
+    if _client is None:
+        if TavilyClient is None:
+            raise ImportError("tavily-python is not installed")
+        _client = TavilyClient(api_key=_api_key())
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the shared httpx.AsyncClient, creating it (and checking the API key) once."""
+    global _aclient
+    if _aclient is None:
+        _aclient = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {_api_key()}"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=DEFAULT_TIMEOUT,
+        )
+    return _aclient
+
+
+async def prewarm_async_client() -> None:
+    """
+    Open a keep-alive connection to the Tavily API ahead of the first search,
+    so the first real request doesn't pay the TCP/TLS handshake. No-op without a key.
+    """
+    if not _API_KEY:
+        return
+    try:
+        await _get_async_client().head("https://api.tavily.com/")
+    except httpx.HTTPError as e:
+        logger.warning("[Tavily Search] Prewarm failed: %s", e)
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client (called from the app's shutdown)."""
+    global _aclient
+    if _aclient is not None:
+        await _aclient.aclose()
+        _aclient = None
+
+
+# Recent successful searches: (query, max_results, depth, include_answer) -> (stored_at, results), LRU order
+_TTL = 300.0
+_CACHE_MAX = 512
+_CacheKey = Tuple[str, int, str, bool]
+_cache: "OrderedDict[_CacheKey, Tuple[float, List[SearchResult]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: _CacheKey) -> Optional[List[SearchResult]]:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at >= _TTL:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return results
+
+
+def _cache_put(key: _CacheKey, results: List[SearchResult]) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), results)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+
+
+# Searches currently running, so identical concurrent calls share one request
+# instead of each hitting the API (sync: threads wait on a Future; async: on the task)
+_inflight: "Dict[_CacheKey, Future]" = {}
+_inflight_lock = threading.Lock()
+_inflight_async: "Dict[_CacheKey, asyncio.Task]" = {}
+
+
+def _to_results(response: Dict[str, Any]) -> List[SearchResult]:
+    """Shape a raw Tavily search response into SearchResults."""
+    results = [
+        SearchResult(
+            result.get("title", ""),
+            result.get("content", ""),
+            result.get("url", ""),
+            result.get("score", 0.0),
+        )
+        for result in response.get("results", ())
+    ]
+    
+    # Include the AI-generated answer if available (built in front, no insert(0) shift)
+    if answer := response.get("answer"):
+        return [SearchResult("Summary", answer, "", 1.0), *results]
+    
+    return results
+
+
+def _shape(
+    results: List[SearchResult], content_max_chars: Optional[int], include_urls: bool
+) -> List[SearchResult]:
+    """Trim results for the caller; cached/shared results are kept whole and never mutated."""
+    if content_max_chars is None and include_urls:
+        return list(results)
+    return [
+        SearchResult(
+            result.title,
+            result.content if content_max_chars is None else result.content[:content_max_chars],
+            result.url if include_urls else "",
+            result.score,
+        )
+        for result in results
+    ]
+
+
+def _resolve_depth(query: str, search_depth: SearchDepth) -> SearchDepth:
+    """Escalate a "basic" search to "advanced" for long or comparative queries."""
+    if search_depth == "advanced":
+        return search_depth
+    words = query.lower().split()
+    if len(words) >= _ADVANCED_MIN_WORDS or not _ADVANCED_WORDS.isdisjoint(words):
+        return "advanced"
+    return "basic"
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, _RETRYABLE_ERRORS):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in _RETRY_STATUSES
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff (0.5s, 1s, 2s, ... capped at 8s) with a little jitter."""
+    return min(8.0, 0.5 * 2 ** attempt) + random.random() * 0.1
+
+
+def _search_with_retry(client: "TavilyClient", **params: Any) -> Dict[str, Any]:
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            return client.search(**params)
+        except Exception as e:
+            if attempt == _MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            time.sleep(_backoff(attempt))
+
+
+async def _post_with_retry(
+    client: httpx.AsyncClient, payload: Dict[str, Any], timeout: float
+) -> Dict[str, Any]:
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            response = await client.post(_TAVILY_SEARCH_URL, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            if attempt == _MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            # Never time.sleep here: it would stall every other search on the loop
+            await asyncio.sleep(_backoff(attempt))
+
+
+def tavily_search_activities(
+    query: str,
+    max_results: int = 5,
+    search_depth: SearchDepth = "basic",
+    include_answer: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    content_max_chars: Optional[int] = DEFAULT_CONTENT_MAX_CHARS,
+    include_urls: bool = True,
+) -> List[SearchResult]:
     """
     Search for activity information using Tavily API.
     
     Args:
         query: Search query string (e.g., "Eiffel Tower tour prices Paris")
         max_results: Maximum number of results to return (default: 5)
+        search_depth: "basic" (default, fast and cheap) or "advanced". Long or
+            comparative queries ("best", "vs", ...) are escalated to "advanced".
+        include_answer: Prepend Tavily's generated summary (default: False)
+        timeout: Seconds to wait for each request to the API (default: 10)
+        content_max_chars: Truncate each result's content to this many characters
+            (default: 400; None keeps the full text)
+        include_urls: Keep result URLs; pass False when they won't be cited (default: True)
     
     Returns:
-        List of search results with title, content, and url
+        List of SearchResults (title, content, url, score); use to_dict() for JSON
     """
-    api_key = os.environ.get("TAVILY_API_KEY")
-    if not api_key:
-        raise ValueError("TAVILY_API_KEY environment variable not set")
+    search_depth = _resolve_depth(query, search_depth)
+    key = (query, max_results, search_depth, include_answer)
+    cached = _cache_get(key)
+    if cached is not None:
+        return _shape(cached, content_max_chars, include_urls)
     
-    client = TavilyClient(api_key=api_key)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return _shape(future.result(), content_max_chars, include_urls)
     
     try:
-        response = client.search(
+        results = _fetch(key, timeout)
+        future.set_result(results)
+        return _shape(results, content_max_chars, include_urls)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _fetch(key: _CacheKey, timeout: float) -> List[SearchResult]:
+    query, max_results, search_depth, include_answer = key
+    client = _get_client()
+    
+    try:
+        response = _search_with_retry(
+            client,
             query=query,
             max_results=max_results,
-            search_depth="advanced",
-            include_answer=True,
-            include_raw_content=False
+            search_depth=search_depth,
+            include_answer=include_answer,
+            include_raw_content=False,
+            timeout=timeout,
         )
         
-        results = []
-        for result in response.get("results", []):
-            results.append({
-                "title": result.get("title", ""),
-                "content": result.get("content", ""),
-                "url": result.get("url", ""),
-                "score": result.get("score", 0.0)
-            })
+        results = _to_results(response)
+        _cache_put(key, results)
+        return results
         
-        # Include the AI-generated answer if available
-        if response.get("answer"):
-            results.insert(0, {
-                "title": "Summary",
-                "content": response["answer"],
-                "url": "",
-                "score": 1.0
-            })
+    except Exception as e:
+        # Only transient failures (retries exhausted) degrade to an error result;
+        # auth/config/parsing errors propagate so the caller sees them once
+        if not _is_retryable(e):
+            raise
+        logger.exception("[Tavily Search] Search failed for query=%r", query)
+        return [SearchResult("Error", str(e), "", 0.0)]
+
+
+def tavily_search_activities_many(
+    queries: List[str],
+    max_results: int = 5,
+    search_depth: SearchDepth = "basic",
+    include_answer: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    content_max_chars: Optional[int] = DEFAULT_CONTENT_MAX_CHARS,
+    include_urls: bool = True,
+) -> List[List[SearchResult]]:
+    """
+    Sync counterpart of tavily_search_activities_batch.
+    
+    Runs the searches on a shared thread pool (all using the one TavilyClient),
+    so N lookups take about one round-trip instead of N. Results are returned
+    in the order of `queries`.
+    """
+    return list(_pool.map(
+        lambda query: tavily_search_activities(
+            query, max_results, search_depth, include_answer, timeout,
+            content_max_chars, include_urls,
+        ),
+        queries,
+    ))
+
+
+async def tavily_search_activities_async(
+    query: str,
+    max_results: int = 5,
+    search_depth: SearchDepth = "basic",
+    include_answer: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    content_max_chars: Optional[int] = DEFAULT_CONTENT_MAX_CHARS,
+    include_urls: bool = True,
+) -> List[SearchResult]:
+    """
+    Async version of tavily_search_activities.
+    
+    Uses the shared httpx.AsyncClient, so concurrent searches reuse keep-alive
+    connections to the Tavily API instead of blocking a thread each.
+    """
+    search_depth = _resolve_depth(query, search_depth)
+    key = (query, max_results, search_depth, include_answer)
+    cached = _cache_get(key)
+    if cached is not None:
+        return _shape(cached, content_max_chars, include_urls)
+    
+    task = _inflight_async.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_async(key, timeout))
+        _inflight_async[key] = task
+        task.add_done_callback(lambda _: _inflight_async.pop(key, None))
+    # shield: one caller being cancelled must not cancel the search the others await
+    return _shape(await asyncio.shield(task), content_max_chars, include_urls)
+
+
+async def _fetch_async(key: _CacheKey, timeout: float) -> List[SearchResult]:
+    query, max_results, search_depth, include_answer = key
+    client = _get_async_client()
+    
+    try:
+        response = await _post_with_retry(client, {
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_answer": include_answer,
+            "include_raw_content": False,
+        }, timeout)
         
+        results = _to_results(response)
+        _cache_put(key, results)
         return results
         
     except Exception as e:
-        print(f"[Tavily Search] Error: {e}")
-        return [{"title": "Error", "content": str(e), "url": "", "score": 0.0}]
+        # Only transient failures (retries exhausted) degrade to an error result;
+        # auth/config/parsing errors propagate so the caller sees them once
+        if not _is_retryable(e):
+            raise
+        logger.exception("[Tavily Search] Search failed for query=%r", query)
+        return [SearchResult("Error", str(e), "", 0.0)]
+
+
+async def tavily_search_activities_batch(
+    queries: List[str],
+    max_results: int = 5,
+    search_depth: SearchDepth = "basic",
+    include_answer: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    content_max_chars: Optional[int] = DEFAULT_CONTENT_MAX_CHARS,
+    include_urls: bool = True,
+) -> List[List[SearchResult]]:
+    """Run several searches concurrently; results are returned in the order of `queries`."""
+    return await asyncio.gather(
+        *(tavily_search_activities_async(
+            query, max_results, search_depth, include_answer, timeout,
+            content_max_chars, include_urls,
+        ) for query in queries)
+    )